@@ -0,0 +1,109 @@
+"""Benchmark hook latency under a heavy enrichment load.
+
+Simulated hook threads wake on a fixed interval and push an event, the way
+pynput/watchdog callbacks do. Enrichment burns CPU for every event to stand
+in for slow WMI queries and log writes. In single-process mode enrichment
+runs on a thread of the same interpreter; in two-process mode it runs in a
+separate process reading the shared ring buffer.
+
+Run with: python benchmarks/bench_capture_latency.py
+"""
+import os
+import sys
+import time
+import queue
+import threading
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "cliplogger"))
+
+from utils.ring_buffer import SharedRingBuffer, EVENT_INPUT
+
+EVENTS = 2000
+INTERVAL = 0.001  # seconds between hook callbacks
+WORK_PER_EVENT = 0.02  # seconds of CPU-bound enrichment per event
+
+
+def heavy_enrichment(seconds=WORK_PER_EVENT):
+    """Busy loop standing in for a slow WMI query."""
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(200))
+    return total
+
+
+def simulate_hooks(push, events=EVENTS, interval=INTERVAL):
+    """Wake like a hook callback and return how late each wakeup was."""
+    latencies = []
+    for i in range(events):
+        start = time.perf_counter()
+        time.sleep(interval)
+        push({"event_type": "MOUSE_CLICK", "data": {"position": [i, i]}})
+        latencies.append(time.perf_counter() - start - interval)
+    return latencies
+
+
+def enrichment_thread(events, stop):
+    while not stop.is_set():
+        try:
+            events.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        heavy_enrichment()
+
+
+def enrichment_process(buffer_name, stop):
+    ring = SharedRingBuffer(buffer_name)
+    while not stop.is_set():
+        if ring.pop() is None:
+            time.sleep(0.001)
+            continue
+        heavy_enrichment()
+    ring.close()
+
+
+def summarize(label, latencies):
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    worst = latencies[-1] * 1e3
+    print(f"{label}: p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {worst:.3f} ms")
+
+
+def bench_single_process():
+    events = queue.Queue()
+    stop = threading.Event()
+    worker = threading.Thread(target=enrichment_thread, args=(events, stop))
+    worker.start()
+    try:
+        return simulate_hooks(events.put)
+    finally:
+        stop.set()
+        worker.join()
+
+
+def bench_two_process():
+    ring = SharedRingBuffer(capacity=1024, record_size=256)
+    stop = multiprocessing.Event()
+    worker = multiprocessing.Process(target=enrichment_process, args=(ring.name, stop))
+    worker.start()
+    try:
+        latencies = simulate_hooks(lambda data: ring.push(EVENT_INPUT, data))
+        stats = ring.get_stats()
+        print(f"ring buffer: {stats['dropped']} dropped, {stats['pending']} pending")
+        return latencies
+    finally:
+        stop.set()
+        worker.join()
+        ring.close()
+
+
+def main():
+    summarize("baseline (no enrichment)", simulate_hooks(lambda data: None))
+    summarize("single process", bench_single_process())
+    summarize("two processes", bench_two_process())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Load-test event forwarding with many simulated agents.
+
+Agents start while the collector is down so that their first events go to
+the disk spool, then the collector comes up and every agent must replay its
+spool and deliver the rest in order. The agents' queues are kept small so
+that the offline burst also exercises the overflow path.
+
+Run with: python benchmarks/bench_forwarding.py [agents] [events per agent]
+"""
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "cliplogger"))
+
+from collector import Collector
+from utils.forwarder import EventForwarder
+
+ADDRESS = "127.0.0.1:9876"
+
+
+def run_agent(forwarder, agent, events, collector_up):
+    for i in range(events):
+        forwarder.send(f"agent{agent} event {i}")
+        if i < events // 2:
+            continue  # First half is one burst, larger than the queue
+        if i == events // 2:
+            collector_up.wait()  # Second half is sent once the collector is up
+        time.sleep(0.001)
+
+
+async def serve_until(collector, stopped):
+    server = await collector.start(ADDRESS)
+    async with server:
+        await stopped.wait()
+
+
+def main(agents=200, events=500):
+    workdir = tempfile.mkdtemp()
+    output = os.path.join(workdir, "collected_log.txt")
+
+    forwarders = []
+    for agent in range(agents):
+        forwarder = EventForwarder(
+            ADDRESS,
+            spool_dir=os.path.join(workdir, f"spool{agent}"),
+            flush_interval=0.2,
+            max_queue=50,  # Small enough that the offline burst overflows
+        )
+        forwarder.host = f"agent{agent}"
+        forwarder.start()
+        forwarders.append(forwarder)
+
+    collector_up = threading.Event()
+    senders = [
+        threading.Thread(target=run_agent, args=(f, i, events, collector_up))
+        for i, f in enumerate(forwarders)
+    ]
+    start = time.perf_counter()
+    for sender in senders:
+        sender.start()
+
+    # Collector is unreachable for the first half of each agent's events
+    time.sleep(2)
+    spooled = sum(f.get_stats()["spooled"] for f in forwarders)
+    overflowed = sum(f.get_stats()["overflowed"] for f in forwarders)
+    print(f"{spooled} batches spooled while the collector was down")
+    print(f"{overflowed} events overflowed the agents' queues")
+
+    loop = asyncio.new_event_loop()
+    collector = Collector(output)
+    stopped = asyncio.Event()
+    server_thread = threading.Thread(
+        target=loop.run_until_complete, args=(serve_until(collector, stopped),)
+    )
+    server_thread.start()
+    collector_up.set()
+
+    for sender in senders:
+        sender.join()
+    dropped = 0
+    while collector.events + dropped < agents * events:
+        time.sleep(0.1)
+        dropped = sum(
+            f.get_stats()["dropped"] + f.get_stats()["spool_dropped"] for f in forwarders
+        )
+    elapsed = time.perf_counter() - start
+
+    for forwarder in forwarders:
+        forwarder.stop()
+    time.sleep(0.5)  # Let the collector see the agents disconnect
+    loop.call_soon_threadsafe(stopped.set)
+    server_thread.join()
+    loop.close()
+    collector.close()
+
+    # Every agent's events must arrive complete and in order
+    received = {}
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            _, agent, _, i = line.split()
+            received.setdefault(agent, []).append(int(i))
+    in_order = all(v == sorted(v) for v in received.values())
+    complete = sum(len(v) for v in received.values()) == agents * events - dropped
+
+    print(f"{collector.events} events in {collector.batches} batches from {agents} agents")
+    print(f"{dropped} events dropped by full overflow buffers or spools")
+    print(f"{collector.events / elapsed:.0f} events/s, complete: {complete}, in order: {in_order}")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,44 @@
+"""Benchmark foreground-process attribution with a fake process table.
+
+Run with: python benchmarks/bench_process_cache.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "cliplogger"))
+
+from utils.process_utils import ProcessCache, FakeProcessTable
+
+
+def main(events=1_000_000, switch_every=1000):
+    table = FakeProcessTable()
+    for pid in range(1, 51):
+        table.add_process(pid, f"app{pid}.exe", f"C:\\Apps\\app{pid}.exe")
+        table.add_window(pid * 100, pid)
+
+    cache = ProcessCache(table)
+
+    # Steady state: foreground window never changes
+    cache.get_foreground_process()
+    start = time.perf_counter()
+    for _ in range(events):
+        cache.get_foreground_process()
+    elapsed = time.perf_counter() - start
+    print(f"steady state: {elapsed / events * 1e9:.0f} ns/event")
+
+    # Foreground switches between applications every `switch_every` events
+    start = time.perf_counter()
+    for i in range(events):
+        if i % switch_every == 0:
+            table.foreground_window = ((i // switch_every) % 50 + 1) * 100
+        cache.get_foreground_process()
+    elapsed = time.perf_counter() - start
+    print(f"switching every {switch_every}: {elapsed / events * 1e9:.0f} ns/event")
+
+    print(f"process lookups: {table.lookups}")
+    print(f"stats: {cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
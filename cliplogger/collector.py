@@ -0,0 +1,108 @@
+import os
+import stat
+import zlib
+import socket
+import asyncio
+import argparse
+from utils.forwarder import (
+    FRAME_HEADER,
+    ACK,
+    MAX_FRAME_SIZE,
+    decode_batch,
+    parse_address,
+)
+
+
+class Collector:
+    """Reference collector that receives batches from many cliplogger agents."""
+
+    def __init__(self, output="collected_log.txt"):
+        self.output = output
+        self.file = open(output, "a", encoding="utf-8")
+
+        # Metrics
+        self.agents = 0
+        self.batches = 0
+        self.events = 0
+
+    async def handle_agent(self, reader, writer):
+        """Read batches from one agent, store them and acknowledge each one."""
+        peer = writer.get_extra_info("peername") or "unix socket"
+        self.agents += 1
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                length, batch_id = FRAME_HEADER.unpack(header)
+                if length > MAX_FRAME_SIZE:
+                    raise ValueError(f"Frame of {length} bytes is too large")
+
+                events = decode_batch(await reader.readexactly(length))
+                self.write_events(events)
+                self.batches += 1
+                self.events += len(events)
+
+                # Only acknowledge once the batch is on disk
+                writer.write(ACK.pack(batch_id))
+                await writer.drain()
+
+        except asyncio.IncompleteReadError:
+            pass  # Agent disconnected
+        except (ConnectionError, ValueError, zlib.error) as e:
+            print(f"Dropping connection from {peer}: {e}")
+        finally:
+            self.agents -= 1
+            writer.close()
+
+    def write_events(self, events):
+        """Append events to the output file, tagged with their host."""
+        self.file.write("".join(f"[{e['host']}] {e['entry']}\n" for e in events))
+        self.file.flush()
+
+    async def start(self, address):
+        """Start listening on host:port or a Unix socket path."""
+        family, addr = parse_address(address)
+        if family == socket.AF_INET:
+            return await asyncio.start_server(self.handle_agent, *addr)
+
+        # Only replace a stale socket, never some other file at that path
+        if os.path.exists(addr):
+            if not stat.S_ISSOCK(os.stat(addr).st_mode):
+                raise ValueError(f"{addr!r} exists and is not a Unix socket")
+            os.remove(addr)
+        return await asyncio.start_unix_server(self.handle_agent, addr)
+
+    def close(self):
+        self.file.close()
+
+
+async def run_collector(address, output):
+    collector = Collector(output)
+    server = await collector.start(address)
+    print(f"Collector listening on {address}, writing to {output}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        collector.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect logs from cliplogger agents")
+    parser.add_argument("address", help="host:port or Unix socket path to listen on")
+    parser.add_argument("--output", default="collected_log.txt")
+    args = parser.parse_args()
+    try:
+        parse_address(args.address)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        asyncio.run(run_collector(args.address, args.output))
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print("\nCollector stopped.")
+
+
+if __name__ == "__main__":
+    main()
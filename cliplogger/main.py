@@ -1,60 +1,223 @@
+import sys
 import time
+import argparse
 import atexit
+import multiprocessing
 from utils.clipboard_utils import get_clipboard_content
-from utils.logger import log_text_entry, log_files_entry, log_paste_entry
+from utils.logger import (
+    log_text_entry,
+    log_file_entry,
+    log_files_entry,
+    log_paste_entry,
+    log_drag_drop_entry,
+    write_log_entry,
+    format_timestamp,
+    add_log_sink,
+)
 from utils.file_monitor import FileMonitor
 from utils.input_monitor import InputMonitor
+from utils.process_utils import get_foreground_process, format_process
+from utils.storage_utils import get_storage_type
+from utils.file_utils import load_category_table, set_content_sniffing
+from utils.capture import run_capture
+from utils.forwarder import EventForwarder, parse_address
+from utils.ring_buffer import (
+    SharedRingBuffer,
+    EVENT_TEXT,
+    EVENT_FILE,
+    EVENT_PASTE,
+    EVENT_INPUT,
+)
 
+# Input event fields that arrive from the capture process as JSON lists
+POSITION_KEYS = ("position", "scroll", "start_pos", "current_pos", "end_pos")
 
-def handle_input_event(event_type, data):
+
+def handle_input_event(event_type, data, process=None, timestamp=None):
     """Handle input events from mouse and keyboard."""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = format_timestamp(timestamp)
 
     if event_type == "KEYBOARD_SHORTCUT":
-        print(f"[{timestamp}] SHORTCUT: {data}")
-        # Log to file
-        with open("clipboard_log.txt", "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] SHORTCUT: {data}\n")
+        app = format_process(process or get_foreground_process())
+        write_log_entry(f"[{timestamp}] SHORTCUT: {data} (app: {app})")
 
     elif event_type == "DRAG_START":
-        print(
-            f"[{timestamp}] DRAG_START: from {data['start_path']} at {data['start_pos']} to {data['current_path']} at {data['current_pos']}"
+        write_log_entry(
+            f"[{timestamp}] DRAG_START: from {data['start_path']} at {data['start_pos']} to {data['current_path']} at {data['current_pos']} (app: {format_process(data['process'])})"
         )
         if data["modifiers"]:
             print(f"  Modifiers: {', '.join(data['modifiers'])}")
 
-        # Log to file
-        with open("clipboard_log.txt", "a", encoding="utf-8") as f:
-            f.write(
-                f"[{timestamp}] DRAG_START: from {data['start_path']} at {data['start_pos']} to {data['current_path']} at {data['current_pos']}\n"
-            )
-
     elif event_type == "DRAG_DROP":
-        print(
-            f"[{timestamp}] DRAG_DROP: from {data['start_path']} at {data['start_pos']} to {data['end_path']} at {data['end_pos']} (distance: {data['distance']:.1f}px)"
+        write_log_entry(
+            f"[{timestamp}] DRAG_DROP: from {data['start_path']} at {data['start_pos']} to {data['end_path']} at {data['end_pos']} (distance: {data['distance']:.1f}px) (app: {format_process(data['process'])})"
         )
         if data["modifiers"]:
             print(f"  Modifiers: {', '.join(data['modifiers'])}")
 
-        # Log to file
-        with open("clipboard_log.txt", "a", encoding="utf-8") as f:
-            f.write(
-                f"[{timestamp}] DRAG_DROP: from {data['start_path']} at {data['start_pos']} to {data['end_path']} at {data['end_pos']} (distance: {data['distance']:.1f}px)\n"
-            )
-
     elif event_type == "MOUSE_CLICK_WITH_MODIFIERS":
         if data["pressed"]:  # Only log press events to avoid spam
-            print(
-                f"[{timestamp}] MOUSE_CLICK: {data['button']} at {data['position']} in {data['location']} with {', '.join(data['modifiers'])}"
+            write_log_entry(
+                f"[{timestamp}] MOUSE_CLICK: {data['button']} at {data['position']} in {data['location']} with {', '.join(data['modifiers'])} (app: {format_process(data['process'])})"
+            )
+
+
+def handle_captured_event(event):
+    """Enrich and log a raw event read from the capture process."""
+    kind = event["kind"]
+    data = event["data"]
+    timestamp = event["timestamp"]  # Capture time, not logging time
+
+    if kind == EVENT_TEXT:
+        log_text_entry(
+            data["content"],
+            process=data["process"],
+            timestamp=timestamp,
+            truncated=event["truncated"],
+        )
+
+    elif kind == EVENT_FILE:
+        log_file_entry(data["path"], process=data["process"], timestamp=timestamp)
+
+    elif kind == EVENT_PASTE:
+        dest_path = data["dest_path"]
+        storage_type = data["storage_type"] or get_storage_type(dest_path)
+        log_paste_entry(dest_path, storage_type, data["operation"], timestamp=timestamp)
+
+    elif kind == EVENT_INPUT:
+        event_type = data["event_type"]
+        event_data = data["data"]
+        if isinstance(event_data, dict):
+            for key in POSITION_KEYS:
+                if isinstance(event_data.get(key), list):
+                    event_data[key] = tuple(event_data[key])
+
+        if event_type == "DRAG_DROP":
+            log_drag_drop_entry(
+                source_path=event_data["start_path"],
+                dest_path=event_data["end_path"],
+                operation="DRAG_DROP",
+                process=event_data["process"],
+                timestamp=timestamp,
             )
-            # Log to file
-            with open("clipboard_log.txt", "a", encoding="utf-8") as f:
-                f.write(
-                    f"[{timestamp}] MOUSE_CLICK: {data['button']} at {data['position']} in {data['location']} with {', '.join(data['modifiers'])}\n"
-                )
+        handle_input_event(event_type, event_data, data["process"], timestamp)
+
+
+def report_ring_overflow(stats, reported):
+    """Print drops and oversized records since the last report."""
+    for key, label in (("dropped", "dropped"), ("oversized", "too large, dropped")):
+        if stats[key] > reported[key]:
+            print(f"Capture buffer overflow: {stats[key] - reported[key]} events {label}")
+            reported[key] = stats[key]
+
+
+def run_two_process(lag_warning=2.0, report_interval=5.0):
+    """Run capture in a separate process and enrich/log events in this one."""
+    print("Clipboard logger started in two-process mode. Press Ctrl+C to stop.")
+
+    ring = SharedRingBuffer()
+    stop_event = multiprocessing.Event()
+    capture = multiprocessing.Process(
+        target=run_capture, args=(ring.name, stop_event), daemon=True
+    )
+    capture.start()
+
+    reported = {"dropped": 0, "oversized": 0}
+    last_report = time.monotonic()
+
+    try:
+        while capture.is_alive():
+            event = ring.pop()
+            if event is None:
+                time.sleep(0.01)
+            else:
+                handle_captured_event(event)
+
+            # Report overflow and lag between capture and logging
+            if time.monotonic() - last_report > report_interval:
+                last_report = time.monotonic()
+                stats = ring.get_stats()
+                report_ring_overflow(stats, reported)
+                lag = time.time() - event["timestamp"] if event else 0
+                if lag > lag_warning:
+                    print(
+                        f"Enrichment lagging {lag:.1f}s behind capture ({stats['pending']} events pending)"
+                    )
+
+    except KeyboardInterrupt:
+        print("\nClipboard logger stopped.")
+    finally:
+        stop_event.set()
+        capture.join(timeout=5)
+
+        # Log whatever the capture process wrote before it stopped
+        event = ring.pop()
+        while event is not None:
+            handle_captured_event(event)
+            event = ring.pop()
+        report_ring_overflow(ring.get_stats(), reported)
+        ring.close()
+
+    if capture.exitcode:
+        print(f"Capture process exited with code {capture.exitcode}")
+    return capture.exitcode or 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Clipboard and file operation logger")
+    parser.add_argument(
+        "--two-process",
+        action="store_true",
+        help="run capture hooks in a separate process",
+    )
+    parser.add_argument(
+        "--forward",
+        metavar="ADDRESS",
+        help="ship log entries to a collector at host:port or a Unix socket path",
+    )
+    parser.add_argument(
+        "--spool-dir",
+        default="cliplogger_spool",
+        help="where to keep entries while the collector is unreachable",
+    )
+    parser.add_argument(
+        "--categories",
+        metavar="FILE",
+        help="JSON file of extra file categories, {category: [extensions]}",
+    )
+    parser.add_argument(
+        "--sniff",
+        action="store_true",
+        help="check file contents to detect renamed executables and archives",
+    )
+    args = parser.parse_args()
+    if args.categories:
+        try:
+            load_category_table(args.categories)
+        except (OSError, ValueError) as e:
+            parser.error(f"--categories: {e}")
+    if args.forward:
+        try:
+            parse_address(args.forward)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
 
 
 def main():
+    args = parse_args()
+
+    set_content_sniffing(args.sniff)
+
+    if args.forward:
+        forwarder = EventForwarder(args.forward, spool_dir=args.spool_dir)
+        forwarder.start()
+        add_log_sink(forwarder.send)
+        atexit.register(forwarder.stop)
+
+    if args.two_process:
+        sys.exit(run_two_process())
+
     last_clipboard = None
     print("Clipboard logger with input monitoring started. Press Ctrl+C to stop.")
 
@@ -0,0 +1,77 @@
+import atexit
+from .clipboard_utils import get_clipboard_content
+from .file_monitor import FileMonitor
+from .input_monitor import InputMonitor
+from .process_utils import get_foreground_process
+from .ring_buffer import (
+    SharedRingBuffer,
+    EVENT_TEXT,
+    EVENT_FILE,
+    EVENT_PASTE,
+    EVENT_INPUT,
+)
+
+
+def run_capture(buffer_name, stop_event, poll_interval=1):
+    """Run the capture sources and write raw events to a shared ring buffer.
+
+    This is the entry point of the capture process in two-process mode. It
+    only holds the hooks, watchers and clipboard poll loop; storage lookups
+    and log writes are left to the process reading the buffer.
+    """
+    ring = SharedRingBuffer(buffer_name)
+
+    def on_input(event_type, data):
+        ring.push(
+            EVENT_INPUT,
+            {
+                "event_type": event_type,
+                "data": data,
+                "process": get_foreground_process(),
+            },
+        )
+
+    def on_paste(dest_path, storage_type, operation):
+        ring.push(
+            EVENT_PASTE,
+            {
+                "dest_path": dest_path,
+                "storage_type": storage_type,
+                "operation": operation,
+            },
+        )
+
+    file_monitor = FileMonitor(on_paste, resolve_storage=False)
+    file_monitor.start_monitoring()
+
+    input_monitor = InputMonitor(on_input, log_drops=False)
+    input_monitor.start_monitoring()
+
+    atexit.register(file_monitor.stop_monitoring)
+    atexit.register(input_monitor.stop_monitoring)
+
+    last_clipboard = None
+    try:
+        while not stop_event.is_set():
+            ctype, content = get_clipboard_content()
+
+            if content != last_clipboard:
+                process = get_foreground_process()
+                if ctype == "text":
+                    ring.push(EVENT_TEXT, {"content": content, "process": process})
+                elif ctype == "files":
+                    for file_path in content:
+                        ring.push(EVENT_FILE, {"path": file_path, "process": process})
+                    # Paste detection stays here so it sees the copy immediately
+                    file_monitor.set_copied_files(content)
+
+                last_clipboard = content
+
+            stop_event.wait(poll_interval)
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        file_monitor.stop_monitoring()
+        input_monitor.stop_monitoring()
+        ring.close()
@@ -6,8 +6,9 @@ from watchdog.events import FileSystemEventHandler
 from .storage_utils import get_storage_type, get_all_drives
 
 class PasteDetector(FileSystemEventHandler):
-    def __init__(self, callback):
+    def __init__(self, callback, resolve_storage=True):
         self.callback = callback
+        self.resolve_storage = resolve_storage  # False leaves it to the consumer
         self.recent_copies = {}  # Changed to dict to store full paths
         self.lock = threading.Lock()
     
@@ -36,7 +37,7 @@ class PasteDetector(FileSystemEventHandler):
                 
                 # Check if this is actually a paste (different location)
                 if os.path.dirname(file_path) != os.path.dirname(original_path):
-                    storage_type = get_storage_type(file_path)
+                    storage_type = get_storage_type(file_path) if self.resolve_storage else None
                     print(f"Detected {operation}: {filename} -> {file_path} ({storage_type})")
                     self.callback(file_path, storage_type, operation)
                     
@@ -44,9 +45,9 @@ class PasteDetector(FileSystemEventHandler):
                     del self.recent_copies[filename]
 
 class FileMonitor:
-    def __init__(self, callback):
+    def __init__(self, callback, resolve_storage=True):
         self.observers = []
-        self.paste_detector = PasteDetector(callback)
+        self.paste_detector = PasteDetector(callback, resolve_storage)
         self.monitored_drives = set()
     
     def start_monitoring(self):
@@ -1,49 +1,188 @@
 import os
+import json
+import stat
+import struct
+from functools import lru_cache
+
+# Default category table. Extend it with register_category or load_category_table.
+CATEGORY_EXTENSIONS = {
+    'document': ['.txt', '.doc', '.docx', '.pdf', '.rtf', '.odt', '.pages'],
+    'spreadsheet': ['.xls', '.xlsx', '.csv', '.ods', '.numbers'],
+    'presentation': ['.ppt', '.pptx', '.key', '.odp'],
+    'image': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.svg', '.webp', '.ico'],
+    'video': ['.mp4', '.avi', '.mov', '.wmv', '.flv', '.mkv', '.webm', '.m4v'],
+    'audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'],
+    'archive': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz'],
+    'code': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.cs', '.php', '.rb', '.go', '.rs', '.swift'],
+    'executable': ['.exe', '.msi', '.app', '.deb', '.rpm', '.dmg'],
+    'data': ['.json', '.xml', '.yaml', '.yml', '.sql', '.db', '.sqlite'],
+    'font': ['.ttf', '.otf', '.woff', '.woff2', '.eot'],
+    'config': ['.ini', '.cfg', '.conf', '.config', '.properties', '.env']
+}
+
+# Flat extension -> category index, built once from the table above
+EXTENSION_INDEX = {}
+
+# Leading bytes of executables and archives, checked to catch renamed files.
+# Windows PE files are checked separately, since "MZ" alone is too short.
+MAGIC_SIGNATURES = [
+    (b'\x7fELF', 'executable'),
+    (b'\xcf\xfa\xed\xfe', 'executable'),  # Mach-O 64-bit
+    (b'\xce\xfa\xed\xfe', 'executable'),  # Mach-O 32-bit
+    (b'PK\x03\x04', 'archive'),
+    (b'PK\x05\x06', 'archive'),  # Empty zip
+    (b'Rar!\x1a\x07', 'archive'),
+    (b"7z\xbc\xaf'\x1c", 'archive'),
+    (b'\x1f\x8b\x08', 'archive'),  # gzip, deflate
+    (b'\xfd7zXZ\x00', 'archive'),
+]
+SNIFF_SIZE = 512
+
+# Content sniffing reads from disk, so it is off unless enabled (main.py --sniff)
+SNIFF_CONTENT = False
+
+# Extensions whose files legitimately start with one of the signatures above
+CONTAINER_EXTENSIONS = {
+    '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.pages', '.numbers', '.key',
+    '.jar', '.apk', '.epub', '.whl',
+}
+
+
+def normalize_extension(extension):
+    """Lowercase an extension and give it a leading dot, e.g. "MD" -> ".md"."""
+    ext = extension.strip().lower()
+    return ext if ext.startswith('.') else '.' + ext
+
+
+def _index_category(category, extensions):
+    for ext in extensions:
+        EXTENSION_INDEX[normalize_extension(ext)] = category
+
+
+for _category, _extensions in CATEGORY_EXTENSIONS.items():
+    _index_category(_category, _extensions)
+
+
+def register_category(category, extensions):
+    """Add extensions to a category, moving them out of any previous one."""
+    extensions = [normalize_extension(ext) for ext in extensions]
+    for ext in extensions:
+        previous = EXTENSION_INDEX.get(ext)
+        if previous is not None and previous != category:
+            CATEGORY_EXTENSIONS[previous].remove(ext)
+
+    CATEGORY_EXTENSIONS.setdefault(category, [])
+    CATEGORY_EXTENSIONS[category].extend(
+        ext for ext in extensions if ext not in CATEGORY_EXTENSIONS[category]
+    )
+    _index_category(category, extensions)
+    _classify.cache_clear()
+
+
+def set_content_sniffing(enabled):
+    """Turn content sniffing in get_file_info on or off."""
+    global SNIFF_CONTENT
+    SNIFF_CONTENT = enabled
+
+
+def load_category_table(path):
+    """Load extra categories from a JSON file of {category: [extensions]}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        table = json.load(f)
+
+    # Validate everything first so a bad entry doesn't leave a partial update
+    if not isinstance(table, dict):
+        raise ValueError(f"{path}: expected an object of {{category: [extensions]}}")
+    for category, extensions in table.items():
+        if not isinstance(extensions, list) or not all(
+            isinstance(ext, str) and ext.strip() for ext in extensions
+        ):
+            raise ValueError(
+                f"{path}: extensions for {category!r} must be a list of strings"
+            )
+
+    for category, extensions in table.items():
+        register_category(category, extensions)
+
 
 def get_file_category(extension):
     """Categorize files based on their extension."""
-    # Convert to lowercase for case-insensitive matching
-    ext = extension.lower()
-    
-    # Define categories
-    categories = {
-        'document': ['.txt', '.doc', '.docx', '.pdf', '.rtf', '.odt', '.pages'],
-        'spreadsheet': ['.xls', '.xlsx', '.csv', '.ods', '.numbers'],
-        'presentation': ['.ppt', '.pptx', '.key', '.odp'],
-        'image': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.svg', '.webp', '.ico'],
-        'video': ['.mp4', '.avi', '.mov', '.wmv', '.flv', '.mkv', '.webm', '.m4v'],
-        'audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'],
-        'archive': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz'],
-        'code': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.cs', '.php', '.rb', '.go', '.rs', '.swift'],
-        'executable': ['.exe', '.msi', '.app', '.deb', '.rpm', '.dmg'],
-        'data': ['.json', '.xml', '.yaml', '.yml', '.sql', '.db', '.sqlite'],
-        'font': ['.ttf', '.otf', '.woff', '.woff2', '.eot'],
-        'config': ['.ini', '.cfg', '.conf', '.config', '.properties', '.env']
-    }
-    
-    # Find the category for the extension
-    for category, extensions in categories.items():
-        if ext in extensions:
+    return EXTENSION_INDEX.get(extension.lower(), 'other')
+
+
+def sniff_category(file_path):
+    """Detect executables and archives from the first bytes of a file."""
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(SNIFF_SIZE)
+    except OSError:
+        return None
+
+    # "MZ" header whose e_lfanew field points at a "PE\0\0" signature
+    if head.startswith(b'MZ') and len(head) >= 0x40:
+        (pe_offset,) = struct.unpack_from('<I', head, 0x3C)
+        if head[pe_offset : pe_offset + 4] == b'PE\x00\x00':
+            return 'executable'
+
+    # bzip2: "BZh", block size digit, then the block magic
+    if head[:3] == b'BZh' and b'1' <= head[3:4] <= b'9' and head[4:10] == b'1AY&SY':
+        return 'archive'
+
+    for signature, category in MAGIC_SIGNATURES:
+        if head.startswith(signature):
             return category
-    
-    # Return 'other' if no category matches
-    return 'other'
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _classify(file_path, ext, size, mtime, sniff):
+    """Classify a regular file. Size and mtime make stale entries miss."""
+    category = get_file_category(ext)
+    if sniff and ext.lower() not in CONTAINER_EXTENSIONS:
+        sniffed = sniff_category(file_path)
+        if sniffed and sniffed != category:
+            return sniffed, True
+    return category, False
+
 
-def get_file_info(file_path):
+def get_file_info(file_path, sniff=None):
     """Get file information including extension, drive, and category."""
+    if sniff is None:
+        sniff = SNIFF_CONTENT
     ext = os.path.splitext(file_path)[1]
     drive = os.path.splitdrive(file_path)[0]
-    
-    if os.path.isdir(file_path):
+    sniffed = False
+
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        st = None
+
+    if st is not None and stat.S_ISDIR(st.st_mode):
         ftype = "FOLDER"
         category = "folder"
+    elif st is not None:
+        ftype = "FILE"
+        category, sniffed = _classify(file_path, ext, st.st_size, st.st_mtime_ns, sniff)
     else:
         ftype = "FILE"
         category = get_file_category(ext)
-    
+
     return {
         'type': ftype,
         'extension': ext,
         'category': category,
-        'drive': drive
-    }
\ No newline at end of file
+        'drive': drive,
+        'sniffed': sniffed
+    }
+
+
+def get_file_info_cache_stats():
+    """Get hit/miss counts of the file classification cache."""
+    info = _classify.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'max_size': info.maxsize
+    }
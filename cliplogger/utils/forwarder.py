@@ -0,0 +1,317 @@
+import os
+import json
+import time
+import zlib
+import queue
+import socket
+import struct
+import threading
+
+# Batch frame: payload length, batch ID. The collector answers with the ID.
+FRAME_HEADER = struct.Struct("!IQ")
+ACK = struct.Struct("!Q")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+def parse_address(address):
+    """Parse "host:port" into a TCP address, anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError(
+            f"Invalid collector address {address!r}: expected host:port "
+            "(Unix socket paths are not supported on this platform)"
+        )
+    return socket.AF_UNIX, address
+
+
+def encode_batch(events):
+    """Encode a batch of events as compressed JSON lines."""
+    lines = "\n".join(json.dumps(event) for event in events)
+    return zlib.compress(lines.encode("utf-8"))
+
+
+def decode_batch(payload):
+    """Decode a batch produced by encode_batch."""
+    lines = zlib.decompress(payload).decode("utf-8")
+    return [json.loads(line) for line in lines.split("\n") if line]
+
+
+def recv_exactly(sock, size):
+    """Read exactly size bytes from a socket."""
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        data += chunk
+    return data
+
+
+class DiskSpool:
+    """Bounded on-disk queue of encoded batches, replayed oldest first.
+
+    Segment files are named "<id>-<event count>.batch", so discarded events
+    can be counted without decoding the batch.
+    """
+
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.dropped_batches = 0
+        self.dropped_events = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self.segments = sorted(f for f in os.listdir(directory) if f.endswith(".batch"))
+        self.size = sum(
+            os.path.getsize(os.path.join(directory, f)) for f in self.segments
+        )
+        self.next_id = self._segment_id(self.segments[-1]) + 1 if self.segments else 0
+
+    def __len__(self):
+        return len(self.segments)
+
+    @staticmethod
+    def _segment_id(name):
+        return int(name.split(".")[0].split("-")[0])
+
+    def _segment_events(self, name):
+        """Get the number of events in a segment."""
+        stem = name.split(".")[0]
+        if "-" in stem:
+            return int(stem.split("-")[1])
+        with open(os.path.join(self.directory, name), "rb") as f:
+            return len(decode_batch(f.read()))
+
+    def append(self, payload, events=None):
+        """Store a batch, discarding the oldest ones if the spool is full."""
+        if events is None:
+            events = len(decode_batch(payload))
+        name = f"{self.next_id:012d}-{events}.batch"
+        self.next_id += 1
+
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(payload)
+        os.replace(path + ".tmp", path)
+        self.segments.append(name)
+        self.size += len(payload)
+
+        while self.size > self.max_bytes and len(self.segments) > 1:
+            self.dropped_events += self._segment_events(self.segments[0])
+            self.dropped_batches += 1
+            self.pop()
+
+    def peek(self):
+        """Get the oldest batch without removing it."""
+        with open(os.path.join(self.directory, self.segments[0]), "rb") as f:
+            return f.read()
+
+    def pop(self):
+        """Remove the oldest batch."""
+        path = os.path.join(self.directory, self.segments.pop(0))
+        self.size -= os.path.getsize(path)
+        os.remove(path)
+
+
+class EventForwarder:
+    """Batch, compress and ship log events to a central collector.
+
+    Events are sent over one persistent connection. Each batch must be
+    acknowledged before the next is sent, so a slow collector holds batches
+    back in the queue. When the queue is full or the collector is
+    unreachable, batches go to a disk spool that is replayed in order after
+    reconnecting.
+    """
+
+    def __init__(
+        self,
+        address,
+        spool_dir="cliplogger_spool",
+        batch_size=200,
+        flush_interval=1.0,
+        max_queue=10000,
+        spool_max_bytes=50 * 1024 * 1024,
+        timeout=10.0,
+    ):
+        self.family, self.address = parse_address(address)
+        self.spool = DiskSpool(spool_dir, spool_max_bytes)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.max_overflow = max_queue
+        self.overflow = []  # Events that did not fit in the queue
+        self.lock = threading.Lock()  # Guards the sequence number and overflow list
+        self.seq = 0
+        self.sock = None
+        self.batch_id = 0
+        self.retry_delay = 1.0
+        self.next_retry = 0
+        self.is_running = False
+        self.thread = None
+        self.host = socket.gethostname()
+
+        # Metrics
+        self.sent_events = 0
+        self.spooled_batches = 0
+        self.dropped_events = 0
+        self.overflowed_events = 0
+
+    def start(self):
+        """Start the sender thread."""
+        if self.is_running:
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Flush what is queued and stop the sender thread."""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self.thread.join()
+        self._disconnect()
+
+    def send(self, entry):
+        """Queue a log entry for forwarding. Never blocks the caller."""
+        event = {"host": self.host, "timestamp": time.time(), "entry": entry}
+        with self.lock:
+            self.seq += 1
+            event["seq"] = self.seq
+            try:
+                self.queue.put_nowait(event)
+            except queue.Full:
+                # Backpressure: the sender thread spills these to disk
+                self.overflowed_events += 1
+                if len(self.overflow) < self.max_overflow:
+                    self.overflow.append(event)
+                else:
+                    self.dropped_events += 1
+
+    def get_stats(self):
+        """Get forwarding counters."""
+        return {
+            "sent": self.sent_events,
+            "queued": self.queue.qsize(),
+            "spooled": len(self.spool),
+            "overflowed": self.overflowed_events,
+            "dropped": self.dropped_events,
+            "spool_dropped": self.spool.dropped_events,
+            "connected": self.sock is not None,
+        }
+
+    def _run(self):
+        while self.is_running or not self.queue.empty():
+            batch = self._collect_batch()
+            spilled = self._spill_overflow(batch)
+
+            if self._connect():
+                self._replay_spool()
+
+            if batch and not spilled:
+                # Anything already spooled must be delivered first
+                if self.sock is None or len(self.spool) or not self._send_batch(
+                    encode_batch(batch)
+                ):
+                    self._spool(batch)
+                else:
+                    self.sent_events += len(batch)
+
+        # Keep anything left over for the next run
+        self._spill_overflow([])
+
+    def _collect_batch(self):
+        """Wait for up to batch_size events or flush_interval seconds."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _spool(self, events):
+        self.spool.append(encode_batch(events), len(events))
+        self.spooled_batches += 1
+
+    def _spill_overflow(self, batch):
+        """After an overflow, spool the batch, queue and overflow in order.
+
+        Overflowed events can be older than some of those still queued, so
+        everything pending is merged by sequence number. Returns True if
+        the batch was spooled.
+        """
+        with self.lock:
+            if not self.overflow:
+                return False
+            events = list(batch)
+            while True:
+                try:
+                    events.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            events.extend(self.overflow)
+            self.overflow = []
+
+        events.sort(key=lambda event: event["seq"])
+        for start in range(0, len(events), self.batch_size):
+            self._spool(events[start : start + self.batch_size])
+        return True
+
+    def _connect(self):
+        """Connect to the collector, backing off after failures."""
+        if self.sock is not None:
+            return True
+        if time.monotonic() < self.next_retry:
+            return False
+        try:
+            sock = socket.socket(self.family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+            self.sock = sock
+            self.retry_delay = 1.0
+            print(f"Connected to collector at {self.address}")
+            return True
+        except OSError as e:
+            self.next_retry = time.monotonic() + self.retry_delay
+            self.retry_delay = min(self.retry_delay * 2, 60.0)
+            print(f"Could not connect to collector at {self.address}: {e}")
+            return False
+
+    def _disconnect(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def _send_batch(self, payload):
+        """Send one batch and wait for its acknowledgement."""
+        self.batch_id += 1
+        try:
+            self.sock.sendall(FRAME_HEADER.pack(len(payload), self.batch_id) + payload)
+            (acked,) = ACK.unpack(recv_exactly(self.sock, ACK.size))
+            if acked != self.batch_id:
+                raise ConnectionError(f"Unexpected ack {acked} for batch {self.batch_id}")
+            return True
+        except OSError as e:
+            print(f"Lost connection to collector: {e}")
+            self._disconnect()
+            return False
+
+    def _replay_spool(self):
+        """Send spooled batches oldest first until the spool is empty."""
+        while len(self.spool) and self.sock is not None:
+            payload = self.spool.peek()
+            if not self._send_batch(payload):
+                return
+            self.sent_events += len(decode_batch(payload))
+            self.spool.pop()
@@ -8,11 +8,13 @@ from pynput.mouse import Button
 from .file_utils import get_file_info
 from .storage_utils import get_storage_type
 from .logger import log_paste_entry, log_drag_drop_entry
+from .process_utils import get_foreground_process
 
 
 class InputMonitor:
-    def __init__(self, callback=None):
+    def __init__(self, callback=None, log_drops=True):
         self.callback = callback or self._default_callback
+        self.log_drops = log_drops  # Disabled when another process does logging
         self.mouse_listener = None
         self.keyboard_listener = None
         self.is_running = False
@@ -134,15 +136,15 @@ class InputMonitor:
 
         # Log mouse events with modifier keys
         modifiers = self._get_current_modifiers()
-        event_data = {
-            "position": (x, y),
-            "button": button.name,
-            "pressed": pressed,
-            "modifiers": modifiers,
-            "location": self._get_window_path(x, y),
-        }
-
         if pressed and modifiers:
+            event_data = {
+                "position": (x, y),
+                "button": button.name,
+                "pressed": pressed,
+                "modifiers": modifiers,
+                "location": self._get_window_path(x, y),
+                "process": get_foreground_process(),
+            }
             self.callback("MOUSE_CLICK_WITH_MODIFIERS", event_data)
 
     def _on_mouse_move(self, x, y):
@@ -168,6 +170,7 @@ class InputMonitor:
                 "scroll": (dx, dy),
                 "modifiers": modifiers,
                 "location": self._get_window_path(x, y),
+                "process": get_foreground_process(),
             }
             self.callback("MOUSE_SCROLL_WITH_MODIFIERS", event_data)
 
@@ -240,6 +243,7 @@ class InputMonitor:
             "start_path": self.drag_start_path,
             "current_path": self._get_window_path(x, y),
             "modifiers": self._get_current_modifiers(),
+            "process": get_foreground_process(),
         }
         self.callback("DRAG_START", event_data)
         self.potential_drag = False  # Prevent multiple drag start events
@@ -253,13 +257,16 @@ class InputMonitor:
 
             if distance > self.drag_threshold:
                 drop_path = self._get_window_path(x, y)
+                process = get_foreground_process()
 
                 # Log the drag and drop operation
-                log_drag_drop_entry(
-                    source_path=self.drag_start_path,
-                    dest_path=drop_path,
-                    operation="DRAG_DROP",
-                )
+                if self.log_drops:
+                    log_drag_drop_entry(
+                        source_path=self.drag_start_path,
+                        dest_path=drop_path,
+                        operation="DRAG_DROP",
+                        process=process,
+                    )
 
                 event_data = {
                     "start_pos": self.drag_start_pos,
@@ -268,5 +275,6 @@ class InputMonitor:
                     "start_path": self.drag_start_path,
                     "end_path": drop_path,
                     "modifiers": self._get_current_modifiers(),
+                    "process": process,
                 }
                 self.callback("DRAG_DROP", event_data)
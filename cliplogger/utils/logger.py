@@ -2,56 +2,94 @@ import time
 import os
 from .file_utils import get_file_info
 from .storage_utils import get_storage_type, is_system_drive
+from .process_utils import get_foreground_process, format_process
 
+# Extra destinations for log entries, e.g. EventForwarder.send
+_log_sinks = []
 
-def log_text_entry(content, log_file="clipboard_log.txt"):
-    """Log text clipboard content."""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"[{timestamp}] TEXT: {content}"
+
+def add_log_sink(sink):
+    """Register a callable that receives every log entry."""
+    _log_sinks.append(sink)
+
+
+def remove_log_sink(sink):
+    """Unregister a log sink."""
+    if sink in _log_sinks:
+        _log_sinks.remove(sink)
+
+
+def format_timestamp(timestamp=None):
+    """Format an event time (seconds since the epoch), defaulting to now."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def write_log_entry(log_entry, log_file="clipboard_log.txt"):
+    """Print a log entry, append it to the log file and pass it to sinks."""
     print(log_entry)
 
     with open(log_file, "a", encoding="utf-8") as f:
         f.write(log_entry + "\n")
 
+    for sink in _log_sinks:
+        sink(log_entry)
+
 
-def log_file_entry(file_path, log_file="clipboard_log.txt"):
+def log_text_entry(
+    content, log_file="clipboard_log.txt", process=None, timestamp=None, truncated=False
+):
+    """Log text clipboard content."""
+    timestamp = format_timestamp(timestamp)
+    process = process or get_foreground_process()
+    log_entry = f"[{timestamp}] TEXT: {content}"
+    if truncated:
+        log_entry += " [truncated]"
+    log_entry += f" (app: {format_process(process)})"
+    write_log_entry(log_entry, log_file)
+
+
+def log_file_entry(file_path, log_file="clipboard_log.txt", process=None, timestamp=None):
     """Log file clipboard content."""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = format_timestamp(timestamp)
     file_info = get_file_info(file_path)
     storage_type = get_storage_type(file_path)
+    process = process or get_foreground_process()
 
-    log_entry = f"[{timestamp}] {file_info['type']}: {file_path} (ext: {file_info['extension']}) (category: {file_info['category']}) (from: {file_info['drive']} - {storage_type})"
-    print(log_entry)
-
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(log_entry + "\n")
+    log_entry = f"[{timestamp}] {file_info['type']}: {file_path} (ext: {file_info['extension']}) (category: {file_info['category']}) (from: {file_info['drive']} - {storage_type}) (app: {format_process(process)})"
+    write_log_entry(log_entry, log_file)
 
 
-def log_files_entry(files, log_file="clipboard_log.txt"):
+def log_files_entry(files, log_file="clipboard_log.txt", process=None):
     """Log multiple files clipboard content."""
+    process = process or get_foreground_process()
     for file_path in files:
-        log_file_entry(file_path, log_file)
+        log_file_entry(file_path, log_file, process)
 
 
-def log_paste_entry(dest_path, storage_type, operation, log_file="clipboard_log.txt"):
+def log_paste_entry(
+    dest_path, storage_type, operation, log_file="clipboard_log.txt", timestamp=None
+):
     """Log file paste operations."""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = format_timestamp(timestamp)
     file_info = get_file_info(dest_path)
     drive = os.path.splitdrive(dest_path)[0]
 
     operation_text = "PASTED" if operation == "paste" else "MOVED"
     log_entry = f"[{timestamp}] {operation_text}: {dest_path} (ext: {file_info['extension']}) (category: {file_info['category']}) (to: {drive} - {storage_type})"
-    print(log_entry)
-
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(log_entry + "\n")
+    write_log_entry(log_entry, log_file)
 
 
 def log_drag_drop_entry(
-    source_path, dest_path, operation="DRAG_DROP", log_file="clipboard_log.txt"
+    source_path,
+    dest_path,
+    operation="DRAG_DROP",
+    log_file="clipboard_log.txt",
+    process=None,
+    timestamp=None,
 ):
     """Log drag and drop operations with source and destination paths."""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = format_timestamp(timestamp)
+    process = process or get_foreground_process()
 
     # Get info for both source and destination
     if source_path and os.path.exists(source_path):
@@ -76,18 +114,12 @@ def log_drag_drop_entry(
         dest_storage = "unknown"
 
     # Create detailed log entry
-    log_entry = f"[{timestamp}] {operation}: {source_path} -> {dest_path} (ext: {source_info['extension']}) (category: {source_info['category']}) (from: {source_drive} - {source_storage} to: {dest_drive} - {dest_storage})"
-    print(log_entry)
-
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(log_entry + "\n")
+    log_entry = f"[{timestamp}] {operation}: {source_path} -> {dest_path} (ext: {source_info['extension']}) (category: {source_info['category']}) (from: {source_drive} - {source_storage} to: {dest_drive} - {dest_storage}) (app: {format_process(process)})"
+    write_log_entry(log_entry, log_file)
 
 
 def log_input_event(event_type, event_data, log_file="clipboard_log.txt"):
     """Log input events (mouse, keyboard)."""
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     log_entry = f"[{timestamp}] {event_type}: {event_data}"
-    print(log_entry)
-
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(log_entry + "\n")
+    write_log_entry(log_entry, log_file)
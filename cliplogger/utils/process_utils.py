@@ -0,0 +1,231 @@
+import time
+import threading
+import psutil
+
+try:
+    import win32gui
+    import win32process
+except ImportError:
+    # Not on Windows - only the fake process table is usable
+    win32gui = None
+    win32process = None
+
+
+UNKNOWN_PROCESS = {"pid": 0, "name": "unknown", "exe": ""}
+
+
+class Win32ProcessTable:
+    """Resolve windows and processes through the Windows API and psutil."""
+
+    def get_foreground_window(self):
+        """Get the handle of the current foreground window."""
+        return win32gui.GetForegroundWindow()
+
+    def get_window_pid(self, hwnd):
+        """Get the ID of the process that owns a window."""
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        return pid
+
+    def get_process_info(self, pid):
+        """Get the name and executable path of a process."""
+        process = psutil.Process(pid)
+        try:
+            exe = process.exe()
+        except psutil.AccessDenied:
+            # Protected system processes hide their executable path
+            exe = ""
+        return {
+            "pid": pid,
+            "name": process.name(),
+            "exe": exe,
+            "create_time": process.create_time(),
+        }
+
+    def get_create_time(self, pid):
+        """Get when a process started, or None if it is gone."""
+        try:
+            return psutil.Process(pid).create_time()
+        except psutil.Error:
+            return None
+
+
+class FakeProcessTable:
+    """In-memory process table for running the cache without Windows."""
+
+    def __init__(self):
+        self.foreground_window = 0
+        self.windows = {}  # hwnd -> pid
+        self.processes = {}  # pid -> (name, exe, create_time)
+        self.lookups = 0
+        self.clock = 0  # Stands in for process start times
+
+    def add_process(self, pid, name, exe=""):
+        """Register a running process, replacing any earlier one with that pid."""
+        self.clock += 1
+        self.processes[pid] = (name, exe, self.clock)
+
+    def add_window(self, hwnd, pid, foreground=True):
+        """Register a window owned by a process."""
+        self.windows[hwnd] = pid
+        if foreground:
+            self.foreground_window = hwnd
+
+    def kill(self, pid):
+        """Remove a process and all its windows."""
+        self.processes.pop(pid, None)
+        for hwnd in [h for h, p in self.windows.items() if p == pid]:
+            del self.windows[hwnd]
+            if self.foreground_window == hwnd:
+                self.foreground_window = 0
+
+    def get_foreground_window(self):
+        return self.foreground_window
+
+    def get_window_pid(self, hwnd):
+        return self.windows.get(hwnd, 0)
+
+    def get_process_info(self, pid):
+        self.lookups += 1
+        if pid not in self.processes:
+            raise psutil.NoSuchProcess(pid)
+        name, exe, create_time = self.processes[pid]
+        return {"pid": pid, "name": name, "exe": exe, "create_time": create_time}
+
+    def get_create_time(self, pid):
+        if pid not in self.processes:
+            return None
+        return self.processes[pid][2]
+
+
+def get_default_process_table():
+    """Get the process table for the current platform."""
+    if win32gui is not None:
+        return Win32ProcessTable()
+    return FakeProcessTable()
+
+
+class ProcessCache:
+    """Cache of window handle -> process ID -> executable.
+
+    The foreground process is only resolved again when the foreground
+    window changes, so repeated events from the same application are a
+    single handle comparison. Entries for exited processes, including ones
+    whose pid was reused by a new process, are evicted periodically.
+    """
+
+    def __init__(self, table=None, sweep_interval=5.0):
+        self.table = table or get_default_process_table()
+        self.sweep_interval = sweep_interval
+        self.window_pids = {}  # hwnd -> pid
+        self.processes = {}  # pid -> process info
+        self.lock = threading.Lock()
+
+        # Foreground (hwnd, process), always read and replaced as one tuple
+        self.foreground = (None, UNKNOWN_PROCESS)
+        self.last_sweep = time.monotonic()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_foreground_process(self):
+        """Get the process that owns the foreground window."""
+        try:
+            hwnd = self.table.get_foreground_window()
+        except Exception:
+            return UNKNOWN_PROCESS
+
+        # Sweep here too so a dead foreground process is noticed without a miss
+        if time.monotonic() - self.last_sweep > self.sweep_interval:
+            self.sweep()
+
+        foreground_hwnd, foreground_process = self.foreground
+        if hwnd == foreground_hwnd:
+            self.hits += 1
+            return foreground_process
+
+        process = self.get_window_process(hwnd)
+        # Don't pin a failed lookup to the window; retry on the next event
+        if process is not UNKNOWN_PROCESS:
+            self.foreground = (hwnd, process)
+        return process
+
+    def get_window_process(self, hwnd):
+        """Get the process that owns a window."""
+        if not hwnd:
+            return UNKNOWN_PROCESS
+
+        with self.lock:
+            if time.monotonic() - self.last_sweep > self.sweep_interval:
+                self._sweep()
+
+            pid = self.window_pids.get(hwnd)
+            if pid is not None and pid in self.processes:
+                self.hits += 1
+                return self.processes[pid]
+
+            self.misses += 1
+            try:
+                pid = self.table.get_window_pid(hwnd)
+                process = self.processes.get(pid)
+                if process is None:
+                    process = self.table.get_process_info(pid)
+                    self.processes[pid] = process
+                self.window_pids[hwnd] = pid
+                return process
+            except Exception:
+                return UNKNOWN_PROCESS
+
+    def sweep(self):
+        """Evict entries for processes that have exited."""
+        with self.lock:
+            self._sweep()
+
+    def _sweep(self):
+        """Evict dead processes. Caller must hold the lock."""
+        self.last_sweep = time.monotonic()
+        # A different start time means the pid now belongs to another process
+        dead = [
+            pid
+            for pid, process in self.processes.items()
+            if self.table.get_create_time(pid) != process["create_time"]
+        ]
+        for pid in dead:
+            del self.processes[pid]
+            self.evictions += 1
+
+        # Window handles can be reused once their process is gone
+        if dead:
+            self.window_pids = {
+                hwnd: pid
+                for hwnd, pid in self.window_pids.items()
+                if pid in self.processes
+            }
+            if self.foreground[1]["pid"] in dead:
+                self.foreground = (None, UNKNOWN_PROCESS)
+
+    def get_stats(self):
+        """Get cache hit/miss metrics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "windows": len(self.window_pids),
+            "processes": len(self.processes),
+        }
+
+
+process_cache = ProcessCache()
+
+
+def get_foreground_process():
+    """Get the process that owns the foreground window."""
+    return process_cache.get_foreground_process()
+
+
+def format_process(process):
+    """Format process info for log entries."""
+    if process["exe"]:
+        return f"{process['name']} - {process['exe']}"
+    return process["name"]
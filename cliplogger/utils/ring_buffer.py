@@ -0,0 +1,145 @@
+import json
+import time
+import struct
+import threading
+from multiprocessing import shared_memory
+
+# Header: write sequence, read sequence, dropped records, oversized records,
+# capacity, record size
+HEADER = struct.Struct("<QQQQII")
+DROPPED_OFFSET = 16
+OVERSIZED_OFFSET = 24
+# Record: event kind, flags, timestamp, payload length
+RECORD_HEADER = struct.Struct("<HHdI")
+
+FLAG_TRUNCATED = 1
+
+# Event kinds
+EVENT_TEXT = 1
+EVENT_FILE = 2
+EVENT_PASTE = 3
+EVENT_INPUT = 4
+
+
+class SharedRingBuffer:
+    """Single-consumer ring buffer of fixed-size records in shared memory.
+
+    The producer never blocks: when the buffer is full the record is
+    dropped and counted instead, so capture hooks are never held up by a
+    slow consumer.
+    """
+
+    def __init__(self, name=None, capacity=4096, record_size=4096):
+        if name is None:
+            size = HEADER.size + capacity * record_size
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            HEADER.pack_into(self.shm.buf, 0, 0, 0, 0, 0, capacity, record_size)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+
+        _, _, _, _, self.capacity, self.record_size = HEADER.unpack_from(self.shm.buf, 0)
+        self.max_payload = self.record_size - RECORD_HEADER.size
+        self.lock = threading.Lock()  # Several hook threads share one producer
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _offset(self, seq):
+        return HEADER.size + (seq % self.capacity) * self.record_size
+
+    def _count(self, offset):
+        """Increment a header counter. Caller must hold the lock."""
+        (value,) = struct.unpack_from("<Q", self.shm.buf, offset)
+        struct.pack_into("<Q", self.shm.buf, offset, value + 1)
+
+    def _truncate(self, data):
+        """Encode data with the longest prefix of its content that fits."""
+        content = data["content"]
+        # Each character takes at least one byte, so longer prefixes never fit
+        low, high = 0, min(len(content), self.max_payload)
+        payload = None
+        while low <= high:
+            middle = (low + high) // 2
+            encoded = json.dumps(dict(data, content=content[:middle])).encode("utf-8")
+            if len(encoded) <= self.max_payload:
+                payload = encoded
+                low = middle + 1
+            else:
+                high = middle - 1
+        return payload
+
+    def push(self, kind, data):
+        """Write an event record. Returns False if it was dropped."""
+        payload = json.dumps(data).encode("utf-8")
+        flags = 0
+
+        if len(payload) > self.max_payload:
+            # Only clipboard text may be cut short; other events are dropped
+            if isinstance(data, dict) and isinstance(data.get("content"), str):
+                payload = self._truncate(data)
+                flags |= FLAG_TRUNCATED
+            else:
+                payload = None
+            if payload is None:
+                with self.lock:
+                    self._count(OVERSIZED_OFFSET)
+                return False
+
+        with self.lock:
+            buf = self.shm.buf
+            write_seq, read_seq = struct.unpack_from("<QQ", buf, 0)
+
+            if write_seq - read_seq >= self.capacity:
+                self._count(DROPPED_OFFSET)
+                return False
+
+            offset = self._offset(write_seq)
+            RECORD_HEADER.pack_into(buf, offset, kind, flags, time.time(), len(payload))
+            start = offset + RECORD_HEADER.size
+            buf[start : start + len(payload)] = payload
+
+            # Publish the record only after it is fully written
+            struct.pack_into("<Q", buf, 0, write_seq + 1)
+            return True
+
+    def pop(self):
+        """Read the next event record, or None if the buffer is empty."""
+        buf = self.shm.buf
+        write_seq, read_seq = struct.unpack_from("<QQ", buf, 0)
+        if read_seq == write_seq:
+            return None
+
+        offset = self._offset(read_seq)
+        kind, flags, timestamp, length = RECORD_HEADER.unpack_from(buf, offset)
+        start = offset + RECORD_HEADER.size
+        data = json.loads(bytes(buf[start : start + length]).decode("utf-8"))
+
+        struct.pack_into("<Q", buf, 8, read_seq + 1)
+
+        return {
+            "kind": kind,
+            "timestamp": timestamp,
+            "truncated": bool(flags & FLAG_TRUNCATED),
+            "data": data,
+        }
+
+    def get_stats(self):
+        """Get buffer fill level and overflow counters."""
+        write_seq, read_seq, dropped, oversized, _, _ = HEADER.unpack_from(self.shm.buf, 0)
+        return {
+            "written": write_seq,
+            "read": read_seq,
+            "pending": write_seq - read_seq,
+            "dropped": dropped,
+            "oversized": oversized,
+            "capacity": self.capacity,
+        }
+
+    def close(self):
+        """Release the shared memory, removing it if this side created it."""
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
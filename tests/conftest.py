@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules are imported as `utils.*`, the same way main.py runs them
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "cliplogger"))
@@ -0,0 +1,145 @@
+import os
+import struct
+
+import pytest
+
+from utils import file_utils
+from utils.file_utils import (
+    CATEGORY_EXTENSIONS,
+    EXTENSION_INDEX,
+    get_file_category,
+    get_file_info,
+    get_file_info_cache_stats,
+    load_category_table,
+    register_category,
+    set_content_sniffing,
+)
+
+PE_HEADER = b"MZ" + b"\x00" * 0x3A + struct.pack("<I", 0x40) + b"PE\x00\x00"
+
+
+@pytest.fixture(autouse=True)
+def restore_tables():
+    categories = {category: list(exts) for category, exts in CATEGORY_EXTENSIONS.items()}
+    index = dict(EXTENSION_INDEX)
+    sniff = file_utils.SNIFF_CONTENT
+    yield
+    CATEGORY_EXTENSIONS.clear()
+    CATEGORY_EXTENSIONS.update(categories)
+    EXTENSION_INDEX.clear()
+    EXTENSION_INDEX.update(index)
+    set_content_sniffing(sniff)
+    file_utils._classify.cache_clear()
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_extension_lookup_is_case_insensitive():
+    assert get_file_category(".PNG") == "image"
+    assert get_file_category(".unknown") == "other"
+
+
+def test_folder(tmp_path):
+    info = get_file_info(str(tmp_path))
+    assert info["type"] == "FOLDER"
+    assert info["category"] == "folder"
+
+
+def test_missing_file_uses_extension(tmp_path):
+    info = get_file_info(str(tmp_path / "gone.mp3"))
+    assert info["type"] == "FILE"
+    assert info["category"] == "audio"
+
+
+def test_sniffing_is_off_by_default(tmp_path):
+    path = write(tmp_path / "notes.txt", PE_HEADER)
+    assert get_file_info(path)["category"] == "document"
+
+
+def test_sniffing_detects_renamed_executable(tmp_path):
+    set_content_sniffing(True)
+    path = write(tmp_path / "notes.txt", PE_HEADER)
+    info = get_file_info(path)
+    assert info["category"] == "executable"
+    assert info["sniffed"]
+
+
+def test_sniffing_ignores_text_starting_with_mz(tmp_path):
+    set_content_sniffing(True)
+    path = write(tmp_path / "notes.txt", b"MZ order 4411 shipped" + b" " * 100)
+    info = get_file_info(path)
+    assert info["category"] == "document"
+    assert not info["sniffed"]
+
+
+def test_sniffing_leaves_zip_based_documents_alone(tmp_path):
+    set_content_sniffing(True)
+    path = write(tmp_path / "report.docx", b"PK\x03\x04" + b"\x00" * 100)
+    assert get_file_info(path)["category"] == "document"
+
+
+def test_cache_hit_for_unchanged_file(tmp_path):
+    path = write(tmp_path / "a.txt", b"text")
+    get_file_info(path)
+    hits = get_file_info_cache_stats()["hits"]
+    get_file_info(path)
+    assert get_file_info_cache_stats()["hits"] == hits + 1
+
+
+def test_cache_invalidated_by_size_change(tmp_path):
+    set_content_sniffing(True)
+    path = write(tmp_path / "a.txt", b"text")
+    assert get_file_info(path)["category"] == "document"
+
+    write(path, PE_HEADER)
+    assert get_file_info(path)["category"] == "executable"
+
+
+def test_cache_invalidated_by_mtime_change(tmp_path):
+    set_content_sniffing(True)
+    path = write(tmp_path / "a.txt", b"PK\x03\x04")
+    assert get_file_info(path)["category"] == "archive"
+
+    # Same size, different content and modification time
+    write(path, b"text")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert get_file_info(path)["category"] == "document"
+
+
+def test_register_category_normalizes_extensions():
+    register_category("document", ["MD", ".Rst"])
+    assert get_file_category(".md") == "document"
+    assert get_file_category(".rst") == "document"
+    assert ".md" in CATEGORY_EXTENSIONS["document"]
+
+
+def test_register_category_moves_extension():
+    register_category("markup", [".html"])
+    assert get_file_category(".html") == "markup"
+    assert ".html" not in CATEGORY_EXTENSIONS["code"]
+    assert CATEGORY_EXTENSIONS["markup"] == [".html"]
+
+
+def test_load_category_table(tmp_path):
+    path = tmp_path / "categories.json"
+    path.write_text('{"markup": ["md", ".RST"]}')
+    load_category_table(str(path))
+    assert get_file_category(".md") == "markup"
+    assert get_file_category(".rst") == "markup"
+
+
+@pytest.mark.parametrize(
+    "content",
+    ['{"markup": ".md"}', '{"markup": [1]}', '["md"]', '{"markup": [""]}', "not json"],
+)
+def test_load_category_table_rejects_invalid_tables(tmp_path, content):
+    path = tmp_path / "categories.json"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        load_category_table(str(path))
+    assert ".m" not in EXTENSION_INDEX
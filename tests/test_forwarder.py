@@ -0,0 +1,155 @@
+import time
+import socket
+import asyncio
+import threading
+
+import pytest
+
+from collector import Collector
+from utils.forwarder import (
+    DiskSpool,
+    EventForwarder,
+    encode_batch,
+    decode_batch,
+    parse_address,
+)
+
+
+def test_spool_replays_in_order(tmp_path):
+    spool = DiskSpool(str(tmp_path))
+    for i in range(5):
+        spool.append(encode_batch([{"i": i}]))
+
+    # A new spool over the same directory picks up where the old one stopped
+    spool = DiskSpool(str(tmp_path))
+    spool.append(encode_batch([{"i": 5}]))
+
+    replayed = []
+    while len(spool):
+        replayed.extend(event["i"] for event in decode_batch(spool.peek()))
+        spool.pop()
+    assert replayed == list(range(6))
+    assert spool.size == 0
+
+
+def test_spool_discards_oldest_when_full(tmp_path):
+    payload = encode_batch([{"entry": "x" * 100}])
+    spool = DiskSpool(str(tmp_path), max_bytes=len(payload) * 3)
+    for _ in range(5):
+        spool.append(payload)
+
+    assert len(spool) == 3
+    assert spool.dropped_batches == 2
+    assert spool.dropped_events == 2
+    assert spool.segments[0] == f"{2:012d}-1.batch"
+    assert spool.size <= spool.max_bytes
+
+
+def test_forwarder_counts_events_discarded_by_spool(tmp_path):
+    # Nothing listens on this port, so every batch goes to the spool
+    forwarder = EventForwarder(
+        "127.0.0.1:1",
+        spool_dir=str(tmp_path / "spool"),
+        batch_size=20,
+        flush_interval=0.01,
+        spool_max_bytes=2000,
+    )
+    forwarder.start()
+    for i in range(2000):
+        forwarder.send(f"event {i} " + "x" * 50)
+    forwarder.stop()
+
+    stats = forwarder.get_stats()
+    spooled = sum(
+        len(decode_batch((tmp_path / "spool" / name).read_bytes()))
+        for name in forwarder.spool.segments
+    )
+    assert stats["spool_dropped"] > 0
+    assert stats["spool_dropped"] + stats["dropped"] + spooled == 2000
+
+
+def test_parse_address():
+    assert parse_address("collector:9000") == (socket.AF_INET, ("collector", 9000))
+    assert parse_address(":9000") == (socket.AF_INET, ("127.0.0.1", 9000))
+
+
+@pytest.mark.skipif(hasattr(socket, "AF_UNIX"), reason="Unix sockets available")
+def test_parse_address_rejects_unix_paths_without_af_unix():
+    with pytest.raises(ValueError):
+        parse_address("collector-host")
+
+
+@pytest.fixture
+def collector(tmp_path):
+    collector = Collector(str(tmp_path / "collected_log.txt"))
+    loop = asyncio.new_event_loop()
+    stopped = asyncio.Event()
+    ready = threading.Event()
+    addresses = []
+
+    async def serve():
+        server = await collector.start("127.0.0.1:0")
+        addresses.append(server.sockets[0].getsockname())
+        ready.set()
+        async with server:
+            await stopped.wait()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),))
+    thread.start()
+    ready.wait()
+    host, port = addresses[0]
+    collector.address = f"{host}:{port}"
+    yield collector
+
+    loop.call_soon_threadsafe(stopped.set)
+    thread.join()
+    loop.close()
+    collector.close()
+
+
+def read_entries(collector):
+    collector.file.flush()
+    with open(collector.output, encoding="utf-8") as f:
+        return [int(line.split()[-1]) for line in f]
+
+
+def test_overflow_is_delivered_in_order(collector, tmp_path):
+    forwarder = EventForwarder(
+        collector.address,
+        spool_dir=str(tmp_path / "spool"),
+        batch_size=5,
+        max_queue=20,
+        flush_interval=0.05,
+    )
+    forwarder.start()
+    for i in range(500):
+        forwarder.send(f"event {i}")
+        if i % 30 == 29:
+            time.sleep(0.01)  # Bursts larger than the queue
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        stats = forwarder.get_stats()
+        if collector.events + stats["dropped"] + stats["spool_dropped"] >= 500:
+            break
+        time.sleep(0.05)
+    forwarder.stop()
+
+    received = read_entries(collector)
+    stats = forwarder.get_stats()
+    assert stats["overflowed"] > 0
+    assert len(received) == 500 - stats["dropped"] - stats["spool_dropped"]
+    assert received == sorted(received)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+def test_collector_does_not_delete_regular_file(tmp_path):
+    path = tmp_path / "collected_log.txt"
+    path.write_text("keep me")
+    collector = Collector(str(tmp_path / "out.txt"))
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(collector.start(str(path)))
+    finally:
+        collector.close()
+    assert path.read_text() == "keep me"
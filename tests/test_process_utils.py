@@ -0,0 +1,77 @@
+from utils.process_utils import ProcessCache, FakeProcessTable, UNKNOWN_PROCESS
+
+
+def make_cache(sweep_interval=60.0):
+    table = FakeProcessTable()
+    table.add_process(1, "a.exe", "C:\\a.exe")
+    table.add_window(10, 1)
+    return table, ProcessCache(table, sweep_interval=sweep_interval)
+
+
+def test_steady_state_hit():
+    table, cache = make_cache()
+    assert cache.get_foreground_process()["name"] == "a.exe"
+    assert cache.get_foreground_process()["name"] == "a.exe"
+
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert table.lookups == 1
+
+
+def test_miss_on_foreground_change():
+    table, cache = make_cache()
+    cache.get_foreground_process()
+
+    table.add_process(2, "b.exe", "C:\\b.exe")
+    table.add_window(20, 2)
+    assert cache.get_foreground_process()["name"] == "b.exe"
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_sweep_evicts_exited_process():
+    table, cache = make_cache()
+    cache.get_foreground_process()
+
+    table.kill(1)
+    cache.sweep()
+
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["processes"] == 0
+    assert stats["windows"] == 0
+
+
+def test_reused_window_handle_after_exit():
+    table, cache = make_cache(sweep_interval=0)
+    cache.get_foreground_process()
+
+    table.kill(1)
+    table.add_process(2, "b.exe")
+    table.add_window(10, 2)
+    assert cache.get_foreground_process()["name"] == "b.exe"
+
+
+def test_unknown_process_when_lookup_fails():
+    table = FakeProcessTable()
+    table.add_window(10, 99)  # Window whose process is already gone
+    cache = ProcessCache(table)
+
+    assert cache.get_foreground_process() is UNKNOWN_PROCESS
+    # The failure is not cached for the window
+    table.add_process(99, "late.exe")
+    assert cache.get_foreground_process()["name"] == "late.exe"
+
+
+def test_sweep_evicts_reused_pid():
+    table, cache = make_cache()
+    cache.get_foreground_process()
+
+    # pid 1 exits and is immediately reused by another program
+    table.kill(1)
+    table.add_process(1, "c.exe", "C:\\c.exe")
+    table.add_window(20, 1)
+    cache.sweep()
+
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_foreground_process()["name"] == "c.exe"
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from utils.ring_buffer import (
+    SharedRingBuffer,
+    RECORD_HEADER,
+    EVENT_TEXT,
+    EVENT_FILE,
+)
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRingBuffer(capacity=4, record_size=128)
+    yield ring
+    ring.close()
+
+
+def test_round_trip(ring):
+    assert ring.push(EVENT_FILE, {"path": "C:\\a.txt"})
+    event = ring.pop()
+    assert event["kind"] == EVENT_FILE
+    assert event["data"] == {"path": "C:\\a.txt"}
+    assert not event["truncated"]
+    assert ring.pop() is None
+
+
+def test_wrap_around_keeps_order(ring):
+    for i in range(10):
+        assert ring.push(EVENT_FILE, {"i": i})
+        assert ring.pop()["data"] == {"i": i}
+
+    stats = ring.get_stats()
+    assert stats["written"] == 10
+    assert stats["pending"] == 0
+
+
+def test_full_buffer_drops_newest(ring):
+    results = [ring.push(EVENT_FILE, {"i": i}) for i in range(6)]
+    assert results == [True] * 4 + [False] * 2
+    assert ring.get_stats()["dropped"] == 2
+    assert [ring.pop()["data"]["i"] for _ in range(4)] == [0, 1, 2, 3]
+
+
+def test_oversized_record_is_counted_in_shared_header(ring):
+    assert not ring.push(EVENT_FILE, {"path": "x" * 500})
+
+    # A second handle sees the counter, as the consumer process would
+    other = SharedRingBuffer(ring.name)
+    try:
+        assert other.get_stats()["oversized"] == 1
+    finally:
+        other.close()
+
+
+@pytest.mark.parametrize("char", ["a", "\u00e9", "\U0001f600"])
+def test_text_is_truncated_to_longest_prefix(ring, char):
+    data = {"content": char * 200, "process": {}}
+    assert ring.push(EVENT_TEXT, data)
+
+    event = ring.pop()
+    content = event["data"]["content"]
+    assert event["truncated"]
+    assert content and set(content) == {char}
+
+    # One more character would not have fit
+    longer = json.dumps(dict(data, content=content + char)).encode("utf-8")
+    assert len(longer) > ring.record_size - RECORD_HEADER.size